@@ -1,34 +1,199 @@
 import os
 import streamlit as st
-from swarm import Swarm, Agent
-from duckduckgo_search import DDGS
-from datetime import datetime, timedelta
-from dotenv import load_dotenv
-from tenacity import retry, stop_after_attempt, wait_fixed
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from itertools import islice
+from urllib.parse import parse_qsl, urlsplit
+from tenacity import (
+    retry, retry_if_exception, stop_after_attempt, wait_exponential, wait_random
+)
+import atexit
+import functools
 import logging
-import html
+from logging.handlers import QueueHandler, QueueListener
+import re
+import hashlib
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import types
 
 # Configuração inicial
-load_dotenv()
 MODEL = "llama3.2"  # Verifique o modelo correto
 CACHE_TIME = timedelta(hours=1)
 MAX_QUERY_LENGTH = 500
+MAX_RESULTS = 10
+CACHE_DB = "cache.db"
+STREAM_FLUSH_INTERVAL = 0.05  # segundos entre atualizações da área de streaming
+STREAM_FLUSH_CHUNKS = 16
+SEARCH_QUERY_TEMPLATE = "{query} after:{date}"
+SEARCH_ERROR_PREFIX = "Erro na pesquisa"
+MAX_CONCURRENT_LLM_CALLS = 4  # chamadas simultâneas ao modelo, somando todas as sessões
+LLM_CALLS_PER_PIPELINE = 2  # redator e revisor rodam ao mesmo tempo
+PIPELINE_QUEUE_TIMEOUT = 1.0  # segundos aguardando uma vaga antes de desistir
+SECTION_MIN_LENGTH = 1500  # tamanho mínimo de cada trecho enviado ao revisor
 DEBUG_MODE = False  # Altere para True para ver informações de debug
 
-# Configurar logging
-logging.basicConfig(filename='app.log', level=logging.ERROR)
+# Tabela de escape equivalente a html.escape(quote=True), aplicada em uma única passada
+_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;'
+})
+
+# Consulta sem espaços nas bordas com 5 a MAX_QUERY_LENGTH caracteres úteis
+_QUERY_RE = re.compile(rf'^\s*(\S.{{3,{MAX_QUERY_LENGTH - 2}}}\S)\s*\Z', re.DOTALL)
+
+# O Streamlit reexecuta este script a cada rerun e o "Clear cache" esvazia o
+# st.cache_resource, então o que deve existir uma única vez por processo fica
+# num módulo à parte, registrado em sys.modules
+_PROCESS_STATE = sys.modules.setdefault(
+    "ia_studies_process_state", types.ModuleType("ia_studies_process_state")
+)
+_PROCESS_LOCK = vars(_PROCESS_STATE).setdefault("lock", threading.Lock())
+
+# Limite de gerações simultâneas, compartilhado entre sessões
+_PIPELINE_SEMAPHORE = vars(_PROCESS_STATE).setdefault(
+    "pipeline_semaphore",
+    threading.BoundedSemaphore(MAX_CONCURRENT_LLM_CALLS // LLM_CALLS_PER_PIPELINE)
+)
+
+# Configurar logging: a escrita em app.log fica numa thread dedicada,
+# e quem registra o erro apenas enfileira o registro
+def setup_logging():
+    """Inicia o listener de logs uma única vez por processo"""
+    root = logging.getLogger()
+    with _PROCESS_LOCK:
+        if any(isinstance(handler, QueueHandler) for handler in root.handlers):
+            return
+
+        log_queue = queue.SimpleQueue()
+        file_handler = logging.FileHandler('app.log')
+        file_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+        listener = QueueListener(log_queue, file_handler)
+
+        root.setLevel(logging.ERROR)
+        root.addHandler(QueueHandler(log_queue))
+        listener.start()
+        atexit.register(listener.stop)
 
-client = Swarm()
-ddgs = DDGS()
+setup_logging()
+
+# swarm (openai, httpx, pydantic) e duckduckgo_search são importados sob demanda
+# para que a primeira renderização da página não espere por eles
+@st.cache_resource
+def get_client():
+    """Cliente Swarm único por processo"""
+    from dotenv import load_dotenv
+    from swarm import Swarm
+    load_dotenv()
+    return Swarm()
+
+@st.cache_resource
+def get_ddgs():
+    """Sessão DuckDuckGo única por processo, mantendo as conexões abertas entre pesquisas"""
+    from duckduckgo_search import DDGS
+    return DDGS(timeout=10)
+
+@st.cache_resource
+def get_executor():
+    """Pool compartilhado para adiantar a pesquisa web enquanto a interface segue"""
+    return ThreadPoolExecutor(max_workers=4)
+
+def cache_key(query, stage):
+    """Gera a chave do cache a partir da consulta normalizada e da etapa"""
+    normalized = " ".join(query.lower().split())
+    return hashlib.blake2b(f"{stage}:{normalized}".encode()).hexdigest()
+
+def _cache_connect():
+    conn = sqlite3.connect(CACHE_DB, timeout=5)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS cache "
+        "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+    )
+    return conn
+
+def cache_get(key):
+    """Busca um valor ainda válido no cache persistente"""
+    with closing(_cache_connect()) as conn:
+        row = conn.execute(
+            "SELECT value FROM cache WHERE key = ? AND expires > ?",
+            (key, time.time())
+        ).fetchone()
+    return row[0] if row else None
+
+def cache_set(key, value):
+    """Salva um valor no cache persistente com validade de CACHE_TIME, descartando os expirados"""
+    now = time.time()
+    with closing(_cache_connect()) as conn, conn:
+        conn.execute("DELETE FROM cache WHERE expires <= ?", (now,))
+        conn.execute(
+            "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+            (key, value, now + CACHE_TIME.total_seconds())
+        )
 
-@retry(stop=stop_after_attempt(3), wait=wait_fixed(1))
+@functools.lru_cache(maxsize=1)
+def _today_str(day_ordinal):
+    """Data atual formatada, recalculada apenas quando o dia muda"""
+    return date.fromordinal(day_ordinal).strftime("%Y-%m-%d")
+
+@functools.lru_cache(maxsize=512)
+def _escape(text):
+    """Escapa HTML, memorizando trechos que se repetem entre pesquisas"""
+    return text.translate(_ESCAPE_TABLE)
+
+def canonical_url(url):
+    """Chave de deduplicação que ignora esquema, fragmento, barra final e ordem da query"""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        # URL malformada (ex.: IPv6 inválido): deduplica pelo texto original
+        return url
+    return (parts.netloc.lower(), parts.path.rstrip('/'), tuple(sorted(parse_qsl(parts.query))))
+
+def iter_news(results):
+    """Formata os resultados sob demanda, descartando URLs repetidas antes do escape"""
+    seen_urls = set()
+    for result in islice(results, MAX_RESULTS):
+        url_key = canonical_url(result['href'])
+        if url_key in seen_urls:
+            continue
+        seen_urls.add(url_key)
+        yield (
+            f"Título: {_escape(result['title'])}\n"
+            f"URL: {result['href']}\n"
+            f"Descrição: {_escape(result['body'])}\n"
+        )
+
+def _is_search_error(error):
+    """Identifica falhas do DuckDuckGo (rede, timeout, rate limit) que valem nova tentativa"""
+    from duckduckgo_search.exceptions import DuckDuckGoSearchException
+    return isinstance(error, DuckDuckGoSearchException)
+
+def _search_failed(retry_state):
+    """Resposta final quando todas as tentativas de pesquisa falham"""
+    error = retry_state.outcome.exception()
+    logging.error(f"{SEARCH_ERROR_PREFIX}: {str(error)}")
+    return f"{SEARCH_ERROR_PREFIX}: {str(error)}"
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=0.1, max=2) + wait_random(0, 0.2),
+    retry=retry_if_exception(_is_search_error),
+    retry_error_callback=_search_failed
+)
 def search_web(query):
     """Realiza pesquisa web com tratamento de erros"""
     try:
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        results = ddgs.text(
-            f"{query} after:{current_date}",
-            max_results=10,
+        current_date = _today_str(date.today().toordinal())
+        results = get_ddgs().text(
+            SEARCH_QUERY_TEMPLATE.format(query=query, date=current_date),
+            max_results=MAX_RESULTS,
             region="br-pt",
             safesearch="Moderate"
         )
@@ -36,80 +201,78 @@ def search_web(query):
         if not results:
             return "Nenhum resultado encontrado."
             
-        news_results = []
-        seen_urls = set()
-        for result in results:
-            if result['href'] not in seen_urls:
-                news_entry = (
-                    f"Título: {html.escape(result['title'])}\n"
-                    f"URL: {result['href']}\n"
-                    f"Descrição: {html.escape(result['body'])}\n"
-                )
-                news_results.append(news_entry)
-                seen_urls.add(result['href'])
-                
-        return "\n\n".join(news_results) if news_results else "Nenhum resultado válido."
+        return "\n\n".join(iter_news(results)) or "Nenhum resultado válido."
         
     except Exception as e:
-        logging.error(f"Erro na pesquisa: {str(e)}")
-        return f"Erro na pesquisa: {str(e)}"
-
-# Configuração dos Agentes
-web_search_agent = Agent(
-    name="Pesquisador Web",
-    instructions="Colete artigos e notícias recentes usando DuckDuckGo",
-    functions=[search_web],
-    model=MODEL
-)
+        if _is_search_error(e):
+            # Falhas de rede/rate limit sobem para o retry
+            raise
+        logging.error(f"{SEARCH_ERROR_PREFIX}: {str(e)}")
+        return f"{SEARCH_ERROR_PREFIX}: {str(e)}"
+
+# Instruções dos Agentes (analista, redator e revisor): todas começam pelo mesmo
+# preâmbulo, para que o backend do modelo possa reaproveitar o prefixo já processado
+# entre as três chamadas de cada geração
+COMMON_INSTRUCTIONS = """Você faz parte de uma equipe que produz artigos de notícias em português para o público do LinkedIn.
+Mantenha sempre um tom profissional, objetivo, informativo e engajador, e nunca utilize emojis.
 
-researcher_agent = Agent(
-    name="Analista de Conteúdo",
-    instructions="""Organize e analise o conteúdo coletado:
+"""
+
+RESEARCHER_INSTRUCTIONS = COMMON_INSTRUCTIONS + """Organize e analise o conteúdo coletado:
     1. Estruture o texto em seções temáticas claras com base nos tópicos coletados.
     2. Verifique a validade e relevância das informações, cruzando dados com pelo menos duas fontes confiáveis.
     3. Adicione contexto histórico ou explicativo quando necessário para tornar o conteúdo mais acessível.
-    4. Priorize informações relevantes ao público do LinkedIn, como insights acionáveis e tendências de mercado.""",
-    model=MODEL
-)
+    4. Priorize insights acionáveis e tendências de mercado."""
 
-writer_agent = Agent(
-    name="Redator Profissional",
-    instructions="""Escreva um artigo de notícias em formato markdown baseado no conteúdo analisado:
-    0. Formato markdown sem emojis
+WRITER_INSTRUCTIONS = COMMON_INSTRUCTIONS + """Escreva um artigo de notícias em markdown baseado no conteúdo analisado:
     1. Estruture em seções: Introdução, Tópicos Principais, Conclusão.
     2. Adicione subtítulos claros e utilize listas quando necessário para facilitar a leitura.
-    3. Mantenha um tom profissional, informativo e engajador, apropriado para redes profissionais como LinkedIn.
-    4. Garanta fluidez e transição entre tópicos, evitando redundâncias.
-    5. Use dados coletados pelo analista, citando fontes no final do artigo (quando aplicável)
-    6. Caso o texto contenha termos técnicos em inglês, mantenha-os em inglês.""",
-    model=MODEL
-)
+    3. Garanta fluidez e transição entre tópicos, evitando redundâncias.
+    4. Use dados coletados pelo analista, citando fontes no final do artigo (quando aplicável)
+    5. Caso o texto contenha termos técnicos em inglês, mantenha-os em inglês."""
 
-proofreader_agent = Agent(
-    name="Revisor Final",
-    instructions="""Realize uma revisão detalhada do artigo, corrigindo:
+PROOFREADER_INSTRUCTIONS = COMMON_INSTRUCTIONS + """O artigo chega em trechos, um de cada vez. Realize uma revisão detalhada do trecho recebido, corrigindo:
     1. Erros gramaticais, ortográficos e de concordância em português.
-    2. O estilo, mantendo o tom profissional e objetivo.
-    3. A formatação em markdown, garantindo que títulos, subtítulos e listas estejam claros.
-    4. Remover qualquer menção a limitação dos agentes Swarm ou do LLaMA
-    5, Garanta que não tenha emojis no texto final.""",
-    model=MODEL
-)
+    2. A formatação em markdown, garantindo que títulos, subtítulos e listas estejam claros.
+    3. Remover qualquer menção a limitação dos agentes Swarm ou do LLaMA
+    Responda somente com o trecho revisado, sem introduções, comentários ou conclusões próprias."""
+
+@st.cache_resource
+def get_agents():
+    """Configuração dos Agentes, criados uma única vez por processo"""
+    from swarm import Agent
+    return dict(
+        researcher=Agent(
+            name="Analista de Conteúdo",
+            instructions=RESEARCHER_INSTRUCTIONS,
+            model=MODEL
+        ),
+        writer=Agent(
+            name="Redator Profissional",
+            instructions=WRITER_INSTRUCTIONS,
+            model=MODEL
+        ),
+        proofer=Agent(
+            name="Revisor Final",
+            instructions=PROOFREADER_INSTRUCTIONS,
+            model=MODEL
+        )
+    )
 
 def validate_input(query):
     """Valida e sanitiza a entrada do usuário"""
-    if not query or len(query.strip()) < 5:
-        raise ValueError("Por favor insira um tópico válido (mínimo 5 caracteres)")
-    
-    if len(query) > MAX_QUERY_LENGTH:
+    if query and len(query) > MAX_QUERY_LENGTH:
         raise ValueError(f"Tópico muito longo (máximo {MAX_QUERY_LENGTH} caracteres)")
+
+    match = _QUERY_RE.match(query or "")
+    if not match:
+        raise ValueError("Por favor insira um tópico válido (mínimo 5 caracteres)")
         
-    return html.escape(query.strip())
+    return _escape(match.group(1))
 
 def debug_step(content, step_name):
-    """Exibe informações de debug quando ativado"""
-    if DEBUG_MODE:
-        st.write(f"""
+    """Exibe informações de debug (chamar apenas com DEBUG_MODE ativado)"""
+    st.write(f"""
         ### Debug: {step_name}
         **Tipo:** `{type(content)}`  
         **Tamanho:** `{len(content)} caracteres`  
@@ -119,32 +282,133 @@ def debug_step(content, step_name):
         ```
         """)
 
-@st.cache_data(ttl=CACHE_TIME, show_spinner=False)
-def process_research(query):
-    """Processa a pesquisa e análise"""
+def iter_sections(fragments):
+    """Agrupa fragmentos de texto em seções de pelo menos SECTION_MIN_LENGTH caracteres,
+    cortando na primeira quebra de parágrafo após esse limite (a última seção pode ser menor)"""
+    buffer = ""
+    for fragment in fragments:
+        buffer += fragment
+        while (cut := buffer.find("\n\n", SECTION_MIN_LENGTH)) != -1:
+            yield buffer[:cut]
+            buffer = buffer[cut + 2:]
+    if buffer.strip():
+        yield buffer
+
+def run_in_background(iterable):
+    """Consome o iterável em outra thread, entregando os itens assim que ficam prontos"""
+    items = queue.Queue()
+    done = object()
+    errors = []
+    stop = threading.Event()
+
+    def pump():
+        try:
+            for item in iterable:
+                items.put(item)
+                if stop.is_set():
+                    break
+            # Encerra o produtor (e o stream do modelo) na própria thread que o executa
+            if hasattr(iterable, "close"):
+                iterable.close()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            items.put(done)
+
+    thread = threading.Thread(target=pump, daemon=True)
+    thread.start()
     try:
-        # Pesquisa Web
-        search_result = client.run(
-            agent=web_search_agent,
-            messages=[{"role": "user", "content": f"Pesquise sobre: {query}"}]
-        )
-        raw_data = search_result.messages[-1]["content"]
-        debug_step(raw_data, "Dados Brutos da Pesquisa")
+        while (item := items.get()) is not done:
+            yield item
+        if errors:
+            raise errors[0]
+    finally:
+        # Se o consumidor desistir antes do fim, espera o produtor parar
+        # para que a vaga da geração só seja liberada com o modelo livre
+        stop.set()
+        thread.join()
+
+@contextmanager
+def pipeline_slot():
+    """Admite uma geração completa ou falha rápido quando o servidor está cheio.
+
+    A vaga cobre todas as etapas da geração (até LLM_CALLS_PER_PIPELINE chamadas
+    simultâneas), então as etapas seguintes não esperam nem falham por falta de vaga.
+    """
+    if not _PIPELINE_SEMAPHORE.acquire(timeout=PIPELINE_QUEUE_TIMEOUT):
+        raise RuntimeError("Servidor ocupado, tente novamente em instantes")
+    try:
+        yield
+    finally:
+        _PIPELINE_SEMAPHORE.release()
+
+def run_agent(client, agent, content):
+    """Executa um agente e devolve o conteúdo da última mensagem"""
+    result = client.run(
+        agent=agent,
+        messages=[{"role": "user", "content": content}]
+    )
+    return result.messages[-1]["content"]
+
+def stream_agent(client, agent, content):
+    """Versão em streaming de run_agent"""
+    return client.run(
+        agent=agent,
+        messages=[{"role": "user", "content": content}],
+        stream=True
+    )
+
+def stream_draft(client, agent, query, clean_data):
+    """Transmite o rascunho do redator e o salva no cache ao final"""
+    try:
+        parts = []
+        draft_stream = stream_agent(client, agent, f"Crie um artigo usando:\n{clean_data}")
+        for chunk in draft_stream:
+            if chunk.get('content'):
+                parts.append(chunk['content'])
+                yield chunk['content']
+        cache_set(cache_key(query, "draft"), "".join(parts))
+
+    except Exception as e:
+        logging.error(f"Erro na redação: {str(e)}")
+        raise
+
+def process_research(query, search_future=None):
+    """Processa a pesquisa e análise e devolve o rascunho em seções, conforme é redigido"""
+    try:
+        draft = cache_get(cache_key(query, "draft"))
+        if draft is not None:
+            return iter_sections([draft])
+
+        client = get_client()
+        agents = get_agents()
+
+        # Pesquisa Web (aproveita a pesquisa adiantada, se houver)
+        raw_data = cache_get(cache_key(query, "raw_data"))
+        if raw_data is None:
+            if search_future is not None:
+                raw_data = search_future.result()
+            else:
+                raw_data = search_web(query)
+            if raw_data.startswith(SEARCH_ERROR_PREFIX):
+                # Não gera (nem salva no cache) um artigo construído sobre a mensagem de erro
+                raise RuntimeError(raw_data)
+            cache_set(cache_key(query, "raw_data"), raw_data)
+        if DEBUG_MODE:
+            debug_step(raw_data, "Dados Brutos da Pesquisa")
 
         # Análise de Conteúdo
-        analysis_result = client.run(
-            agent=researcher_agent,
-            messages=[{"role": "user", "content": f"Analise estes dados:\n{raw_data}"}]
-        )
-        clean_data = analysis_result.messages[-1]["content"]
-        debug_step(clean_data, "Dados Processados")
+        clean_data = cache_get(cache_key(query, "clean_data"))
+        if clean_data is None:
+            clean_data = run_agent(
+                client, agents["researcher"], f"Analise estes dados:\n{raw_data}"
+            )
+            cache_set(cache_key(query, "clean_data"), clean_data)
+        if DEBUG_MODE:
+            debug_step(clean_data, "Dados Processados")
 
-        # Redação Inicial
-        draft_result = client.run(
-            agent=writer_agent,
-            messages=[{"role": "user", "content": f"Crie um artigo usando:\n{clean_data}"}]
-        )
-        return draft_result.messages[-1]["content"]
+        # Redação Inicial (em streaming, consumida pelo revisor seção a seção)
+        return iter_sections(stream_draft(client, agents["writer"], query, clean_data))
 
     except Exception as e:
         logging.error(f"Erro no processamento: {str(e)}")
@@ -164,6 +428,7 @@ def main():
     # Gerenciamento de estado
     if 'article' not in st.session_state:
         st.session_state.article = ""
+        st.session_state.article_bytes = b""
     
     # Formulário de entrada
     with st.form(key="main_form"):
@@ -186,35 +451,62 @@ def main():
     if submit_btn and query_input:
         try:
             clean_query = validate_input(query_input)
+            # Uma vaga por geração: falha rápido aqui, nunca no meio das etapas
+            with pipeline_slot():
+                # Dispara a pesquisa web em paralelo antes de montar a interface
+                st.session_state.search_future = None
+                needs_search = (
+                    cache_get(cache_key(clean_query, "draft")) is None
+                    and cache_get(cache_key(clean_query, "raw_data")) is None
+                )
+                if needs_search:
+                    st.session_state.search_future = get_executor().submit(search_web, clean_query)
             
-            with st.status("Processando...", expanded=True) as status:
-                # Pesquisa e análise
-                st.write("🔍 Realizando pesquisa web...")
-                article_draft = process_research(clean_query)
+                with st.status("Processando...", expanded=True) as status:
+                    # Pesquisa e análise
+                    st.write("🔍 Realizando pesquisa web...")
+                    draft_sections = process_research(
+                        clean_query, st.session_state.search_future
+                    )
                 
-                # Geração do artigo com streaming
-                st.write("✍️ Gerando artigo em tempo real...")
-                proofread_stream = client.run(
-                    agent=proofreader_agent,
-                    messages=[{"role": "user", "content": f"Revise:\n{article_draft}"}],
-                    stream=True
-                )
+                    # Geração do artigo com streaming
+                    st.write("✍️ Gerando artigo em tempo real...")
 
-                # Configurar área de streaming
-                article_placeholder = st.empty()
-                full_response = ""
+                    # Configurar área de streaming
+                    article_placeholder = st.empty()
+                    parts = []
+                    pending = 0
+                    last_flush = time.monotonic()
                 
-                # Processar cada chunk do stream
-                for chunk in proofread_stream:
-                    if chunk.get('content'):
-                        full_response += chunk['content']
-                        # Atualizar o texto em tempo real com efeito de digitação
-                        article_placeholder.markdown(full_response + "▌")
+                    # Revisar cada seção enquanto o redator escreve as seguintes
+                    with closing(run_in_background(draft_sections)) as sections:
+                        for section in sections:
+                            if parts:
+                                parts.append("\n\n")
+                            proofread_stream = stream_agent(
+                                get_client(),
+                                get_agents()["proofer"],
+                                f"Revise este trecho do artigo:\n{section}"
+                            )
+
+                            # Processar cada chunk do stream
+                            for chunk in proofread_stream:
+                                if chunk.get('content'):
+                                    parts.append(chunk['content'])
+                                    pending += 1
+                                    # Atualizar o texto em lotes com efeito de digitação
+                                    now = time.monotonic()
+                                    if pending >= STREAM_FLUSH_CHUNKS or now - last_flush > STREAM_FLUSH_INTERVAL:
+                                        article_placeholder.markdown("".join(parts) + "▌")
+                                        pending = 0
+                                        last_flush = now
                 
-                # Atualizar estado e interface
-                article_placeholder.markdown(full_response)
-                st.session_state.article = full_response
-                status.update(label="Artigo completo! ✅", state="complete")
+                    # Atualizar estado e interface
+                    full_response = "".join(parts)
+                    article_placeholder.markdown(full_response)
+                    st.session_state.article = full_response
+                    st.session_state.article_bytes = full_response.encode("utf-8")
+                    status.update(label="Artigo completo! ✅", state="complete")
 
         except Exception as e:
             st.error(f"Erro: {str(e)}")
@@ -227,7 +519,7 @@ def main():
         
         st.download_button(
             label="Baixar Artigo",
-            data=st.session_state.article,
+            data=st.session_state.article_bytes,
             file_name="artigo_llm.md",
             mime="text/markdown"
         )